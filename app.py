@@ -1,9 +1,33 @@
+import asyncio
+import atexit
+import logging
 import os
+from collections import defaultdict
 from request import RoleRequest
-import json
-from config import STATE_FILE_NAME
+import orjson
+from config import (
+    CLOSED_FILE_NAME,
+    STATE_FILE_NAME,
+    STATE_FLUSH_INTERVAL,
+    STATE_FLUSH_MAX_PENDING,
+    WAL_COMPACT_THRESHOLD,
+    WAL_FILE_NAME,
+)
 from typing import Optional
 
+# Same logger as bot.py, which attaches the handlers
+logger = logging.getLogger('bot_logger')
+
+
+def _default(obj):
+    """
+    orjson 'default' hook that serializes RoleRequests straight from the objects.
+    """
+
+    if isinstance(obj, RoleRequest):
+        return obj.to_dict()
+    raise TypeError
+
 
 class RequestsManager:
     def __init__(self):
@@ -13,7 +37,21 @@ class RequestsManager:
 
         self.requests: dict = {}
         # dict of lists to support multiple requests per thread
-        self.closed_requests: dict = {}
+        self.closed_requests: defaultdict[int, list[RoleRequest]] = defaultdict(list)
+
+        # Append-only log of every change since the last snapshot, see '_log'
+        self._wal = None
+        self._wal_seq: int = 0  # Sequence number of the last logged change
+        self._wal_entries: int = 0  # Changes logged since the last snapshot
+
+        # WAL lines waiting for the background flusher, so a burst of votes becomes one write
+        self._pending: list[bytes] = []
+        # Closed requests waiting to be appended to the closed requests file
+        self._pending_closed: list[bytes] = []
+        self._dirty = asyncio.Event()
+        self._flush_now = asyncio.Event()  # Set once 'STATE_FLUSH_MAX_PENDING' changes are waiting
+        self._flush_interval = STATE_FLUSH_INTERVAL  # seconds
+        atexit.register(self.flush)
 
     def add_request(
         self, user_id: int, thread_id: int, title: str, end_time: str, role: str = None
@@ -36,7 +74,7 @@ class RequestsManager:
         request = RoleRequest(user_id, thread_id, title, end_time, role)
         # Thread ID == Request ID
         self.requests[request.thread_id] = request
-        self.save_state()
+        self._log("add", request=request)
         return request.thread_id
 
     def update_bot_message_id(self, request_id: int, bot_message_id: int):
@@ -50,7 +88,7 @@ class RequestsManager:
 
         try:
             self.requests[request_id].bot_message_id = bot_message_id
-            self.save_state()
+            self._log("update_bot_message_id", request_id=request_id, bot_message_id=bot_message_id)
         except KeyError:
             raise ValueError("Invalid request ID.")
 
@@ -62,14 +100,18 @@ class RequestsManager:
             request_id (int): The ID of the request.
             user_id (int): The ID of the user voting.
             votes (int): The number of votes. Negative are "no" votes.
+
+        Returns:
+            bool: True if the user had already voted and their vote was changed.
         """
 
         try:
             # Uses change_vote so this function can do double duty
-            self.requests[request_id].vote_or_change(user_id, votes)
-            self.save_state()
+            changed = self.requests[request_id].vote_or_change(user_id, votes)
         except KeyError:
             raise ValueError("Invalid request ID.")
+        self._log("vote", request_id=request_id, user_id=user_id, votes=votes)
+        return changed
 
     def remove_vote_on_request(self, request_id: int, user_id: int):
         """
@@ -82,7 +124,7 @@ class RequestsManager:
 
         try:
             self.requests[request_id].remove_vote(user_id)
-            self.save_state()
+            self._log("remove_vote", request_id=request_id, user_id=user_id)
         except KeyError:
             raise ValueError("Invalid request ID.")
 
@@ -98,7 +140,7 @@ class RequestsManager:
 
         try:
             self.requests[request_id].submit_feedback(user_id, feedback)
-            self.save_state()
+            self._log("feedback", request_id=request_id, user_id=user_id, feedback=feedback)
         except KeyError:
             raise ValueError("Invalid request ID.")
 
@@ -129,10 +171,26 @@ class RequestsManager:
             list[RoleRequest] | None: List of role request objects or None if not found.
         """
 
-        try:
-            return self.closed_requests[thread_id]
-        except KeyError:
-            return None
+        # Not an index, that would insert an empty list into the defaultdict
+        return self.closed_requests.get(thread_id)
+
+    def get_any_request(self, thread_id: int) -> Optional[RoleRequest]:
+        """
+        Get the most recent request in a thread, the active one or else the last closed one.
+
+        Args:
+            thread_id (int): The ID of the request thread.
+
+        Returns:
+            RoleRequest | None: The role request object or None if the thread never had one.
+        """
+
+        request = self.requests.get(thread_id)
+        if request is not None:
+            return request
+
+        closed = self.closed_requests.get(thread_id)
+        return closed[-1] if closed else None
 
     def remove_request(self, request_id: int):
         """
@@ -144,7 +202,7 @@ class RequestsManager:
 
         try:
             del self.requests[request_id]
-            self.save_state()
+            self._log("remove", request_id=request_id)
         except KeyError:
             raise ValueError("Invalid request ID.")
 
@@ -158,54 +216,264 @@ class RequestsManager:
 
         try:
             self.requests[request_id].closed = True
-            if self.closed_requests.get(request_id) is None:
-                self.closed_requests[request_id] = [self.requests[request_id]]
-            else:
-                self.closed_requests[request_id].append(
-                    self.requests[request_id])
+            self.closed_requests[request_id].append(self.requests[request_id])
 
+            # Closed requests never change again, so they live in their own append-only file
+            self._pending_closed.append(orjson.dumps(self.requests[request_id], default=_default) + b"\n")
             del self.requests[request_id]
-            self.save_state()
+            self._log("close", request_id=request_id)
         except KeyError:
             raise ValueError("Invalid request ID.")
 
+    def _get_wal(self):
+        """
+        Get the WAL file handle, opening it in append mode on first use.
+        Kept open for the bot's lifetime and unbuffered, '_flusher' already hands it one joined write per batch.
+        Dependent on 'WAL_FILE_NAME' constant in config.
+        """
+
+        if self._wal is None:
+            self._wal = open(WAL_FILE_NAME, "ab", buffering=0)
+        return self._wal
+
+    def _log(self, op: str, **payload):
+        """
+        Queue a single change for the WAL instead of rewriting the whole state file.
+        The change is written out by '_flusher'.
+
+        Args:
+            op (str): The kind of change, see '_replay' for the supported values.
+            **payload: The arguments needed to replay the change.
+        """
+
+        self._wal_seq += 1
+        self._pending.append(orjson.dumps({"seq": self._wal_seq, "op": op, **payload}, default=_default) + b"\n")
+        self._wal_entries += 1
+        self._dirty.set()
+        if len(self._pending) >= STATE_FLUSH_MAX_PENDING:
+            self._flush_now.set()
+
+    async def _flusher(self):
+        """
+        Background task that writes queued changes at most every '_flush_interval' seconds,
+        or as soon as 'STATE_FLUSH_MAX_PENDING' changes are waiting, off the event loop.
+        Folds the WAL into a new snapshot once it holds 'WAL_COMPACT_THRESHOLD' entries.
+        Start it once the event loop is running.
+        Dependent on 'STATE_FLUSH_MAX_PENDING' and 'WAL_COMPACT_THRESHOLD' constants in config.
+        """
+
+        while True:
+            await self._dirty.wait()
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._dirty.clear()
+            self._flush_now.clear()
+
+            # Closed requests are written before the WAL, see 'load_state' for why
+            # Hold the WAL until they're written if that fails, the next pass retries
+            if not await self._drain_closed():
+                self._dirty.set()
+                continue
+
+            lines = b"".join(self._pending)
+            self._pending = []
+            compact_entries = self._wal_entries if self._wal_entries >= WAL_COMPACT_THRESHOLD else 0
+            try:
+                if compact_entries:
+                    # Serialize on the loop so the writer thread never sees requests mid-change
+                    snapshot = self._snapshot()
+                    self._wal_entries = 0
+                    await asyncio.to_thread(self._write_snapshot, snapshot)
+                elif lines:
+                    await asyncio.to_thread(self._append_wal, lines)
+            except Exception:
+                # Put the lines back, replaying is keyed on 'seq' so writing them twice is harmless
+                logger.exception("Failed to write requests state, retrying.")
+                if lines:
+                    self._pending.insert(0, lines)
+                if compact_entries:
+                    self._wal_entries += compact_entries
+                self._dirty.set()
+
+    async def _drain_closed(self) -> bool:
+        """
+        Write '_pending_closed' to the closed requests file off the event loop until it's empty.
+        A request closed while a write is in progress is picked up by the next round,
+        so its 'close' never reaches the WAL before the request reaches the closed requests file.
+
+        Returns:
+            bool: False if a write failed, the unwritten lines are queued again.
+        """
+
+        while self._pending_closed:
+            closed_lines = b"".join(self._pending_closed)
+            self._pending_closed = []
+            try:
+                await asyncio.to_thread(self._append_closed, closed_lines)
+            except Exception:
+                logger.exception("Failed to write closed requests, retrying.")
+                self._pending_closed.insert(0, closed_lines)
+                return False
+        return True
+
+    def flush(self):
+        """
+        Synchronously write any queued changes to the WAL. Runs at exit.
+        """
+
+        self._flush_closed()
+
+        if self._pending:
+            lines = b"".join(self._pending)
+            self._pending = []
+            self._append_wal(lines)
+
+    def _flush_closed(self):
+        """
+        Synchronously write any queued closed requests to the closed requests file.
+        Call it before anything that writes the WAL or a snapshot, see 'load_state' for why.
+        """
+
+        if self._pending_closed:
+            closed_lines = b"".join(self._pending_closed)
+            self._pending_closed = []
+            self._append_closed(closed_lines)
+
+    def _append_wal(self, lines: bytes):
+        """
+        Append already serialized WAL lines to the long-lived WAL handle.
+
+        Args:
+            lines (bytes): Newline terminated WAL entries.
+        """
+
+        self._get_wal().write(lines)
+
+    def _append_closed(self, lines: bytes):
+        """
+        Append already serialized closed requests to the closed requests file.
+        Dependent on 'CLOSED_FILE_NAME' constant in config.
+
+        Args:
+            lines (bytes): Newline terminated closed requests.
+        """
+
+        with open(CLOSED_FILE_NAME, "ab") as file:
+            file.write(lines)
+
+    def _replay(self, entry: dict):
+        """
+        Apply a single WAL entry to the in-memory state without logging it again.
+
+        Args:
+            entry (dict): The decoded WAL line.
+        """
+
+        op = entry["op"]
+        if op == "add":
+            request = RoleRequest.from_dict(entry["request"])
+            self.requests[request.thread_id] = request
+            return
+
+        request = self.requests.get(entry["request_id"])
+        if request is None:
+            return
+
+        if op == "update_bot_message_id":
+            request.bot_message_id = entry["bot_message_id"]
+        elif op == "vote":
+            request.vote_or_change(entry["user_id"], entry["votes"])
+        elif op == "remove_vote":
+            request.remove_vote(entry["user_id"])
+        elif op == "feedback":
+            request.submit_feedback(entry["user_id"], entry["feedback"])
+        elif op == "remove":
+            del self.requests[entry["request_id"]]
+        elif op == "close":
+            # Already loaded from the closed requests file
+            del self.requests[entry["request_id"]]
+
+    def _snapshot(self) -> bytes:
+        """
+        Serialize the current state of 'self.requests'. Closed requests are kept in their own file.
+
+        Returns:
+            bytes: The json snapshot contents.
+        """
+
+        return orjson.dumps(
+            {
+                "wal_seq": self._wal_seq,
+                "requests": self.requests,
+            },
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+    def _write_snapshot(self, snapshot: bytes):
+        """
+        Atomically write a snapshot to disk and truncate the WAL it supersedes.
+        Dependent on 'STATE_FILE_NAME' constant in config.
+
+        Args:
+            snapshot (bytes): The json snapshot contents from '_snapshot'.
+        """
+
+        # Write next to the real file and swap it in, so a crash never leaves a half-written snapshot
+        tmp_file_name = STATE_FILE_NAME + ".tmp"
+        with open(tmp_file_name, "wb") as file:
+            file.write(snapshot)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_file_name, STATE_FILE_NAME)
+
+        # Everything logged so far is part of the snapshot now
+        self._get_wal().truncate(0)
+
     def save_state(self):
         """
-        Save the current state of 'self.requests' to a json file.
+        Synchronously save the current state of 'self.requests' to a json snapshot and truncate the WAL.
         Dependent on 'STATE_FILE_NAME' constant in config.
         """
 
-        with open(STATE_FILE_NAME, "w") as file:
-            json.dump(
-                {
-                    "requests": {
-                        request_id: request.to_dict()
-                        for request_id, request in self.requests.items()
-                    },
-                    "closed_requests": {
-                        request_id: [request.to_dict() for request in requests]
-                        for request_id, requests in self.closed_requests.items()
-                    },
-                },
-                file,
-            )
+        # The snapshot no longer holds closed requests and drops their 'close' entries from the WAL
+        self._flush_closed()
+        self._pending = []
+        self._wal_entries = 0
+        self._write_snapshot(self._snapshot())
 
     def load_state(self):
         """
-        Load the state of 'self.requests' from a json file.
-        Dependent on 'STATE_FILE_NAME' constant in config.
+        Load the state of 'self.requests' from a json file, then replay the WAL on top of it.
+        Closed requests are loaded from their own file.
+        Dependent on 'STATE_FILE_NAME', 'WAL_FILE_NAME' and 'CLOSED_FILE_NAME' constants in config.
         """
 
+        self.requests = {}
+        self.closed_requests = defaultdict(list)
+        self._wal_seq = 0
+
+        if os.path.exists(CLOSED_FILE_NAME):
+            with open(CLOSED_FILE_NAME, "rb") as file:
+                for line in file:
+                    try:
+                        request = RoleRequest.from_dict(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        # Torn last line from a crash mid-write
+                        break
+                    self.closed_requests[request.thread_id].append(request)
+
         if os.path.exists(STATE_FILE_NAME):
-            with open(STATE_FILE_NAME, "r") as file:
+            # Snapshots are swapped in atomically, but a file left by an older non-atomic write can still be empty
+            with open(STATE_FILE_NAME, "rb") as file:
                 file_content = file.read().strip()
-                if not file_content:
-                    self.requests = {}
-                    self.closed_requests = {}
-                    print("File is empty or contains only whitespace. Starting Fresh.")
-                    return
 
-                data = json.loads(file_content)
+            if not file_content:
+                logger.warning("State file is empty or contains only whitespace. Starting fresh.")
+            else:
+                data = orjson.loads(file_content)
 
                 # Migration code
                 # Todo: Remove this in the future
@@ -215,16 +483,60 @@ class RequestsManager:
                         "closed_requests": {},
                     }
 
+                self._wal_seq = data.get("wal_seq", 0)
                 self.requests = {
                     int(request_id): RoleRequest.from_dict(request_data)
                     for request_id, request_data in data.get("requests", {}).items()
                 }
-                self.closed_requests = {
-                    int(request_id): [RoleRequest.from_dict(request_data) for request_data in requests]
-                    for request_id, requests in data.get("closed_requests", {}).items()
-                }
-            print("Loaded requests state from file.")
+
+                # Migration code: closed requests used to be part of the snapshot
+                # Todo: Remove this in the future
+                if data.get("closed_requests") and not os.path.exists(CLOSED_FILE_NAME):
+                    for requests in data["closed_requests"].values():
+                        for request_data in requests:
+                            request = RoleRequest.from_dict(request_data)
+                            self.closed_requests[request.thread_id].append(request)
+                            self._pending_closed.append(orjson.dumps(request, default=_default) + b"\n")
+                    self.flush()
+                    self.save_state()
+
+                logger.info("Loaded requests state from file.")
         else:
-            self.requests = {}
-            self.closed_requests = {}
-            print("No requests state file found. Starting fresh.")
+            logger.info("No requests state file found. Starting fresh.")
+
+        if os.path.exists(WAL_FILE_NAME):
+            replayed = 0
+            with open(WAL_FILE_NAME, "rb") as file:
+                for line in file:
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # Torn last line from a crash mid-write, everything before it is intact
+                        break
+
+                    # Already part of the snapshot (crashed between snapshot and truncate)
+                    if entry["seq"] <= self._wal_seq:
+                        continue
+
+                    self._replay(entry)
+                    self._wal_seq = entry["seq"]
+                    replayed += 1
+
+            # The WAL always exists after the first run, only worth a line when it held something
+            if replayed:
+                logger.info(f"Replayed {replayed} changes from the WAL.")
+
+            # Start from a clean snapshot so a torn line can't corrupt the next append
+            if os.path.getsize(WAL_FILE_NAME):
+                self.save_state()
+
+        # A crash after a closed request was written but before its 'close' reached the WAL
+        # leaves it in both places; the closed requests file wins
+        closed = {
+            (request.thread_id, request.end_time)
+            for requests in self.closed_requests.values()
+            for request in requests
+        }
+        for request_id, request in list(self.requests.items()):
+            if (request.thread_id, request.end_time) in closed:
+                del self.requests[request_id]
@@ -1,17 +1,22 @@
 import asyncio
+import atexit
 import discord
+import functools
+import heapq
 import os
 import dotenv
 import logging
-import matplotlib.pyplot as plt
+import logging.handlers
 import io
-from utils import get_user_votes, send_long_message
-from discord.ext import tasks
+import queue
+import math
+import threading
+import time
+from utils import get_cached_user, get_user_votes, send_long_message
 from discord import Embed, Colour
-from datetime import datetime, timezone
 from config import (
-    CHECK_TIME,
     PROMPT_AFTER_FIRST_FEEDBACK,
+    FEEDBACK_MODAL_TIMEOUT,
     PROMPT_NO_VOTERS_FOR_FEEDBACK,
     PROMPT_YES_VOTERS_FOR_FEEDBACK,
     VOTE_TIME_PERIOD,
@@ -21,15 +26,40 @@ from config import (
     VALID_ROLES,
     LOG_FILE_NAME,
     CLOSE_POST,
+    MEMBER_COUNT_EDIT_DELAY,
 )
 from app import RequestsManager
 from request import RoleRequest
 
 # SETUP AND INITIALIZATION
 
+# Use uvloop if it's installed (not available on Windows), has to happen before the bot creates its event loop
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 bot = discord.Bot()
 app = RequestsManager()
-app.load_state()
+_flusher_task = None  # Background task writing 'app' changes to disk, started in on_ready
+_scheduler_task = None  # Background task ending votes at their deadline, started in on_ready
+
+# Deadlines of active votes as a min-heap of (end_time, thread_id), drained by _vote_scheduler()
+_vote_deadlines: list[tuple[int, int]] = []
+_deadlines_changed = asyncio.Event()
+_end_vote_tasks: set = set()  # end_vote() calls started by _vote_scheduler() that are still running
+# Active VoteViews keyed by thread ID
+_views_by_thread: dict = {}
+_guild = None  # Guild of the role requests channel, resolved in on_ready
+# Roles of '_guild' by name, kept current by the on_guild_role_* events
+_roles_by_name: dict = {}
+# Forum tags of the role requests channel by name, kept current by on_guild_channel_update
+_tags_by_name: dict = {}
+# Figure and axes reused for every vote results pie chart, created by _get_pie_axes() on first use
+_pie_fig = None
+_pie_ax = None
+_pie_lock = threading.Lock()  # Charts are rendered off the event loop, one at a time
 
 # Configure logging
 
@@ -49,13 +79,22 @@ def setup_logger():
         console_handler.setFormatter(logging.Formatter(
             "%(asctime)s - %(levelname)s - %(message)s"))
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # Logging calls only enqueue the record, a background thread does the actual writing
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        # Writes out whatever is still queued on shutdown
+        atexit.register(listener.stop)
+
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     return logger
 
 
 logger = setup_logger()
+# After the logger exists, so load messages end up in the log file
+app.load_state()
 
 
 ####################################
@@ -63,7 +102,7 @@ logger = setup_logger()
 class VoteView(discord.ui.View):
     def __init__(
         self,
-        thread_owner: discord.User,
+        thread_owner: discord.User | discord.Member,
         thread_id: int,
         thread_title: str,
         end_time: int,
@@ -72,7 +111,7 @@ class VoteView(discord.ui.View):
         Initialize the VoteView class.
 
         Args:
-            thread_owner (discord.User): The owner of the thread.
+            thread_owner (discord.User | discord.Member): The owner of the thread.
             thread_id (int): The ID of the thread (also the request ID).
             thread_title (str): The title of the thread.
             end_time (int): The end time of the vote as a timestamp.
@@ -80,12 +119,16 @@ class VoteView(discord.ui.View):
 
         # Called every time the bot restarts
         super().__init__(timeout=None)
-        self.thread_owner: discord.User = thread_owner
+        self.thread_owner: discord.User | discord.Member = thread_owner
         self.thread_title = thread_title
         self.thread_id = thread_id
         self.end_time = end_time
+        # Pending member count edit, so a burst of votes results in a single edit
+        self._edit_task: asyncio.Task | None = None
+        self._edit_requested = False  # Votes came in that the pending edit hasn't picked up yet
+        self._last_rendered_count: int = -1  # Member count last edited into the vote message
 
-        self.check_time.start()
+        _schedule_vote_end(self)
 
     @discord.ui.button(label="Yes", style=discord.ButtonStyle.success, custom_id="vote_yes")
     async def yes_button_callback(self, button, interaction):
@@ -103,7 +146,7 @@ class VoteView(discord.ui.View):
         """
         Handle a vote interaction.
         Dependant on the 'PROMPT_NO_VOTERS_FOR_FEEDBACK', 'PROMPT_YES_VOTERS_FOR_FEEDBACK', 
-        and 'PROMPT_AFTER_FIRST_FEEDBACK' constants in config.py
+        'PROMPT_AFTER_FIRST_FEEDBACK' and 'FEEDBACK_MODAL_TIMEOUT' constants in config.py
 
         Args:
             interaction (discord.Interaction): The interaction that triggered the vote.
@@ -119,7 +162,6 @@ class VoteView(discord.ui.View):
 
         try:
             request = app.get_request(self.thread_id)
-            vote_changed = request.has_voted(user.id)
 
             # Handle feedback prompt modal
             request_has_feedback = len(request.feedback) > 0
@@ -136,28 +178,36 @@ class VoteView(discord.ui.View):
                 modal = VoteModal(vote_type)
                 await interaction.response.send_modal(modal)
 
-                # Wait for the modal to be submitted
+                # Wait for the modal to be submitted, if it never is the vote still counts without feedback
                 try:
-                    await modal.wait()
+                    await asyncio.wait_for(modal.wait(), timeout=FEEDBACK_MODAL_TIMEOUT)
+                    feedback = modal.feedback.value or ""
                 except asyncio.TimeoutError:
-                    return
-
-                feedback = modal.feedback.value
+                    modal.stop()
+            else:
+                # Acknowledge right away, the confirmation below is then sent as a followup
+                await interaction.response.defer(ephemeral=True)
 
-            role_votes = get_user_votes(user, request)
+            # A changed vote keeps the weight it was cast with, only new votes look at the user's roles
+            previous_votes = request.votes.get(user.id)
+            role_votes = abs(previous_votes) if previous_votes is not None else get_user_votes(user, request)
 
             # Negate are 'no' votes, positive are 'yes'
-            app.vote_on_request(self.thread_id,
-                                user.id, role_votes * (-1 if vote_type == "no" else 1))
+            vote_changed = app.vote_on_request(self.thread_id,
+                                               user.id, role_votes * (-1 if vote_type == "no" else 1))
             await self._update_displayed_member_count()
 
             response_message = f"You {'changed your vote to' if vote_changed else 'voted'} {vote_type.capitalize()} with {role_votes} votes."
 
             if feedback != "":
-                await self.submit_feedback(interaction, user.id, feedback)
                 response_message += " Your feedback has been recorded and sent."
-
-            await interaction.respond(response_message, ephemeral=True)
+                # Independent requests, the feedback is recorded before either is sent
+                await asyncio.gather(
+                    self.submit_feedback(interaction, user.id, feedback),
+                    interaction.respond(response_message, ephemeral=True),
+                )
+            else:
+                await interaction.respond(response_message, ephemeral=True)
 
         except Exception as e:
             logger.error(
@@ -216,33 +266,57 @@ class VoteView(discord.ui.View):
 
     async def _update_displayed_member_count(self):
         """
-        Called whenever the displayed member count needs to update
+        Called whenever the displayed member count needs to update.
+        Schedules a delayed edit, votes made before it runs are included in the same edit.
+        Dependent on 'MEMBER_COUNT_EDIT_DELAY' constant in config.
         """
 
-        thread = bot.get_channel(self.thread_id)
-        request = app.get_request(self.thread_id)
-        vote_message_id = request.bot_message_id
-        vote_message = bot.get_message(vote_message_id) or await thread.fetch_message(vote_message_id)
+        self._edit_requested = True
+        if self._edit_task is None or self._edit_task.done():
+            self._edit_task = asyncio.create_task(
+                self._edit_member_count_after(MEMBER_COUNT_EDIT_DELAY))
 
-        # Edit the member count on the embed
-        embed = vote_message.embeds[0]
-        embed.set_field_at(
-            index=2,  # the 3rd field
-            name="",
-            value=f"`{request.num_users}` {'member has' if request.num_users == 1 else 'members have'} voted on this request.",
-            inline=False,
-        )
-        await vote_message.edit(embed=embed)
+    async def _edit_member_count_after(self, delay: float):
+        """
+        Edit the member count on the vote message after 'delay' seconds, using the count at that time.
+        Waits and edits again if more votes came in while the edit was being made.
 
-    @tasks.loop(seconds=CHECK_TIME)
-    async def check_time(self):
+        Args:
+            delay (float): The number of seconds to wait before editing.
         """
-        Check if the voting period has ended and end the vote if it has.
+
+        while True:
+            await asyncio.sleep(delay)
+            # Votes from here on aren't guaranteed to make it into this edit
+            self._edit_requested = False
+            await self._edit_member_count()
+            if not self._edit_requested:
+                return
+
+    async def _edit_member_count(self):
+        """
+        Edit the current member count into the vote message.
         """
 
-        print("checking...")
-        if int(datetime.now(timezone.utc).timestamp()) >= self.end_time:
-            await end_vote(self)
+        # The vote may have ended in the meantime
+        request = app.get_request(self.thread_id)
+        if request is None:
+            return
+
+        # Skip the edit if the votes since the last one didn't change the count, e.g. a changed vote
+        num_users = request.num_users
+        if num_users == self._last_rendered_count:
+            return
+
+        try:
+            # The whole embed is rebuilt, so the message doesn't need to be fetched first
+            vote_message = bot.get_partial_messageable(
+                self.thread_id).get_partial_message(request.bot_message_id)
+            await vote_message.edit(embed=_build_vote_embed(request, self.thread_owner))
+            self._last_rendered_count = num_users
+        except Exception as e:
+            logger.error(
+                f"Failed to update member count in thread {self.thread_id}: {e}")
 
 
 class VoteModal(discord.ui.Modal):
@@ -264,6 +338,62 @@ class VoteModal(discord.ui.Modal):
         await interaction.response.defer()
 
 
+def _get_pie_axes():
+    """
+    Create the pie chart figure the first time it's needed, so matplotlib is only imported once a vote ends.
+    Must be called with '_pie_lock' held.
+
+    Returns:
+        matplotlib.axes.Axes: The cleared axes of the reused figure.
+    """
+
+    global _pie_fig, _pie_ax
+
+    if _pie_fig is None:
+        # Rendered with Agg outside of pyplot's global state
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        _pie_fig = Figure()
+        FigureCanvasAgg(_pie_fig)
+        _pie_ax = _pie_fig.add_subplot()
+
+    _pie_ax.clear()
+    return _pie_ax
+
+
+@functools.lru_cache(maxsize=64)
+def _render_pie_ratio(yes: int, no: int) -> bytes:
+    with _pie_lock:
+        ax = _get_pie_axes()
+        ax.pie([yes, no], labels=['Yes', 'No'], colors=['green', 'red'],
+               autopct='%1.1f%%', startangle=90, textprops={'color': 'w', 'size': 'x-large'})
+        ax.axis('equal')
+
+        # Save the plot with a transparent background
+        buf = io.BytesIO()
+        _pie_fig.savefig(buf, format='png', bbox_inches='tight',
+                         pad_inches=0, transparent=True)
+        return buf.getvalue()
+
+
+def _render_vote_pie(yes_votes: int, no_votes: int) -> bytes:
+    """
+    Render the vote results pie chart as PNG bytes.
+    Charts are cached by the reduced yes:no ratio, as e.g. 2:1 and 4:2 look the same.
+
+    Args:
+        yes_votes (int): The number of yes votes.
+        no_votes (int): The number of no votes.
+
+    Returns:
+        bytes: The PNG image.
+    """
+
+    divisor = math.gcd(yes_votes, no_votes) or 1
+    return _render_pie_ratio(yes_votes // divisor, no_votes // divisor)
+
+
 async def _finish_vote(thread: discord.Thread, request: RoleRequest):
     """
     Finish the voting process and display the results.
@@ -279,36 +409,28 @@ async def _finish_vote(thread: discord.Thread, request: RoleRequest):
     # Edit the original bot message to show the vote results and remove the view
     logger.info("Editing vote message to show results...")
     try:
-        vote_message = await thread.fetch_message(request.bot_message_id)
         yes_votes, no_votes = request.get_votes()
-        outcome = "Approved" if request.result() is True else "Denied"
+        approved: bool = request.result() is True
+        outcome = "Approved" if approved else "Denied"
 
         total_votes = yes_votes + no_votes
+        has_votes = total_votes > 0
+        # One division, the two percentages always add up to 100
         yes_percentage = (yes_votes / total_votes) * \
-            100 if total_votes > 0 else 0
-        no_percentage = (no_votes / total_votes) * \
-            100 if total_votes > 0 else 0
+            100 if has_votes else 0
+        no_percentage = 100 - yes_percentage if has_votes else 0
         file = None
 
-        if total_votes > 0:
-            # Create a pie chart
-            fig, ax = plt.subplots()
-            ax.pie([yes_votes, no_votes], labels=['Yes', 'No'], colors=['green', 'red'],
-                   autopct='%1.1f%%', startangle=90, textprops={'color': 'w', 'size': 'x-large'})
-            ax.axis('equal')
-
-            # Save the plot to a BytesIO object with a transparent background
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight',
-                        pad_inches=0, transparent=True)
-            buf.seek(0)
+        if has_votes:
+            # Create a pie chart, rendering blocks so keep it off the event loop
+            buf = io.BytesIO(await asyncio.to_thread(_render_vote_pie, yes_votes, no_votes))
 
             # Create a file from the BytesIO object
             file = discord.File(buf, filename="vote_pie.png")
 
         embed = Embed(
             title=f"Voting Results - {request.role} - **{outcome}**",
-            colour=Colour.green() if outcome == "Approved" else Colour.red(),
+            colour=Colour.green() if approved else Colour.red(),
         )
         embed.add_field(
             name=f"Yes Votes{'' if request.ignore_vote_weight else ' (weighted)'}",
@@ -322,7 +444,7 @@ async def _finish_vote(thread: discord.Thread, request: RoleRequest):
         )
 
         # Add member count
-        if total_votes > 0:
+        if has_votes:
             embed.add_field(
                 name=f"Total participating members: `{request.num_users}`",
                 value="",
@@ -331,7 +453,7 @@ async def _finish_vote(thread: discord.Thread, request: RoleRequest):
 
         # Add veto disclaimer
         if request.veto is not None:
-            user = await bot.get_or_fetch_user(request.veto[0])
+            user = await get_cached_user(bot, request.veto[0])
             embed.add_field(
                 name="",
                 value=f"*This request's outcome was overruled by {user.mention}*",
@@ -340,33 +462,40 @@ async def _finish_vote(thread: discord.Thread, request: RoleRequest):
 
         # Deal with image
         if file:
+            # PartialMessage.edit() can't upload files, so the full message is needed here
+            vote_message = await thread.fetch_message(request.bot_message_id)
             embed.set_image(url=f"attachment://{file.filename}")
             await vote_message.edit(content=None, embed=embed, view=None, file=file)
         else:
+            # Only edited, so there's no need to fetch it first
+            vote_message = thread.get_partial_message(request.bot_message_id)
             embed.add_field(name="", value="No votes cast.", inline=False)
             await vote_message.edit(content=None, embed=embed, view=None)
 
         logger.info("Edited vote message.")
 
         # Add the tag "Approved" or "Denied" to the thread, then close it
-        approved_tag = discord.utils.get(
-            thread.parent.available_tags, name=THREAD_TAGS["Approved"])
-        denied_tag = discord.utils.get(
-            thread.parent.available_tags, name=THREAD_TAGS["Denied"])
+        # 'outcome' doubles as the THREAD_TAGS key
+        outcome_tag = _tags_by_name.get(THREAD_TAGS[outcome])
 
-        if outcome == "Approved" and approved_tag and approved_tag not in thread.applied_tags:
-            await thread.edit(applied_tags=thread.applied_tags + [approved_tag])
-        elif outcome == "Denied" and denied_tag and denied_tag not in thread.applied_tags:
-            await thread.edit(applied_tags=thread.applied_tags + [denied_tag])
+        # Collect everything into a single edit
+        edits = {}
+        if outcome_tag and outcome_tag not in thread.applied_tags:
+            edits["applied_tags"] = thread.applied_tags + [outcome_tag]
 
         # Close and lock the thread
         if CLOSE_POST:
-            await thread.edit(archived=True, locked=True)
+            edits.update(archived=True, locked=True)
+
+        if edits:
+            await thread.edit(**edits)
 
         # Log the result
+        # Formatted by logging itself, and only when INFO is enabled
         logger.info(
-            f"Vote finished for request '{request.thread_id}' - {request.role}: {outcome}. "
-            f"Yes: {yes_votes} ({yes_percentage:.2f}%), No: {no_votes} ({no_percentage:.2f}%)\n{'==' * 10}\n\n"
+            "Vote finished for request '%s' - %s: %s. Yes: %s (%.2f%%), No: %s (%.2f%%)\n%s\n\n",
+            request.thread_id, request.role, outcome,
+            yes_votes, yes_percentage, no_votes, no_percentage, "==" * 10,
         )
 
     except discord.NotFound:
@@ -378,6 +507,76 @@ async def _finish_vote(thread: discord.Thread, request: RoleRequest):
         logger.exception(f"Failed to edit vote message: {e}")
 
 
+def _schedule_vote_end(view: VoteView):
+    """
+    Register a view with the vote scheduler so its vote ends at 'view.end_time'.
+
+    Args:
+        view (VoteView): The VoteView instance.
+    """
+
+    _views_by_thread[view.thread_id] = view
+    heapq.heappush(_vote_deadlines, (view.end_time, view.thread_id))
+    _deadlines_changed.set()
+
+
+def _unschedule_vote_end(thread_id: int):
+    """
+    Unregister a view from the vote scheduler. Its heap entry is skipped once it comes up.
+
+    Args:
+        thread_id (int): The ID of the request thread.
+    """
+
+    _views_by_thread.pop(thread_id, None)
+
+
+async def _vote_scheduler():
+    """
+    Single background task that ends votes when their voting period is over.
+    Sleeps until the earliest deadline instead of polling every active view.
+    """
+
+    while True:
+        delay = _vote_deadlines[0][0] - time.time() if _vote_deadlines else None
+        if delay is None or delay > 0:
+            # Wake up early if a new, possibly sooner, deadline gets scheduled
+            try:
+                await asyncio.wait_for(_deadlines_changed.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            _deadlines_changed.clear()
+            continue
+
+        end_time, thread_id = heapq.heappop(_vote_deadlines)
+        view = _views_by_thread.get(thread_id)
+
+        # Skip votes that were ended early, deleted or replaced by a newer vote in the same thread
+        if view is None or view.end_time != end_time or app.get_request(thread_id) is None:
+            continue
+
+        # Ended in its own task, so one slow close doesn't hold up the other deadlines that are due
+        # Unregistered right away so nothing else can end it before the task starts
+        _unschedule_vote_end(thread_id)
+        task = asyncio.create_task(end_vote(view))
+        _end_vote_tasks.add(task)
+        task.add_done_callback(functools.partial(_vote_ended, thread_id))
+
+
+def _vote_ended(thread_id: int, task: asyncio.Task):
+    """
+    Done callback for the end_vote() tasks started by _vote_scheduler().
+
+    Args:
+        thread_id (int): The ID of the request thread.
+        task (asyncio.Task): The finished end_vote() call.
+    """
+
+    _end_vote_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Failed to end vote in thread {thread_id}: {task.exception()}", exc_info=task.exception())
+
+
 # Can't actually be part of the VoteView class for some reason...
 async def end_vote(view: VoteView):
     """
@@ -388,7 +587,10 @@ async def end_vote(view: VoteView):
         view (VoteView): The VoteView instance.
     """
 
-    view.check_time.stop()
+    _unschedule_vote_end(view.thread_id)
+    # Don't let a pending member count edit overwrite the results
+    if view._edit_task is not None:
+        view._edit_task.cancel()
     request: RoleRequest = app.get_request(view.thread_id)
     logger.info(
         f"# Ending vote with thread id '{view.thread_id}': \"{request.title}\"\n")
@@ -413,9 +615,9 @@ async def end_vote(view: VoteView):
             await _finish_vote(thread, request)
             return
 
-        # Get guild and role from the discord api
-        guild = (bot.get_channel(CHANNEL_ID) or await bot.fetch_guild(CHANNEL_ID)).guild
-        role = discord.utils.get(guild.roles, name=request.role)
+        # Get guild and role from the caches built in on_ready
+        guild = _guild
+        role = _roles_by_name.get(request.role)
 
         if not role:
             logger.error(
@@ -425,8 +627,12 @@ async def end_vote(view: VoteView):
             return
 
         # Get the member from the user (yes it's confusing)
+        # Views created by _init_request already hold the member, only views restored on startup hold a user
         # NOTE: This will crash if they left the server, which isn't that much of an issue I suppose
-        member = guild.get_member(view.thread_owner.id) or await guild.fetch_member(view.thread_owner.id)
+        if isinstance(view.thread_owner, discord.Member):
+            member = view.thread_owner
+        else:
+            member = guild.get_member(view.thread_owner.id) or await guild.fetch_member(view.thread_owner.id)
 
         if not member:
             logger.error(
@@ -474,22 +680,90 @@ async def on_ready():
     Updates the bot object with information loaded from the state file.
     """
 
+    global _flusher_task, _scheduler_task, _guild
+
     logger.info(f"Logged in as {bot.user}")
-    # Load all active role requests from the saved state on restart
-    for request in app.requests.values():
-        request: RoleRequest
-        print(request.to_dict())
-        thread_owner_id = request.user_id
-        thread_owner = await bot.get_or_fetch_user(thread_owner_id)
-        thread_title = request.title
-        thread_id = request.thread_id
-        end_time = request.end_time
-        bot.add_view(view=VoteView(thread_owner, thread_id,
-                     thread_title, end_time), message_id=request.bot_message_id)
+
+    # Started first so votes still end and state is still written if anything below fails
+    # on_ready can fire again after a reconnect, only ever run one of each
+    if _flusher_task is None:
+        _flusher_task = asyncio.create_task(app._flusher())
+    if _scheduler_task is None:
+        _scheduler_task = asyncio.create_task(_vote_scheduler())
+
+    # The channel isn't always in the cache yet
+    forum = bot.get_channel(CHANNEL_ID)
+    if forum is None:
+        try:
+            forum = await bot.fetch_channel(CHANNEL_ID)
+        except discord.HTTPException as e:
+            logger.error(f"Failed to fetch the role requests channel {CHANNEL_ID}: {e}")
+
+    if forum is not None:
+        _guild = forum.guild
+        # Reversed so duplicate names resolve to the lowest role, like discord.utils.get did
+        _roles_by_name.clear()
+        _roles_by_name.update({role.name: role for role in reversed(_guild.roles)})
+        _cache_forum_tags(forum)
+
+    async def restore(request: RoleRequest):
+        thread_owner = await get_cached_user(bot, request.user_id)
+        bot.add_view(view=VoteView(thread_owner, request.thread_id,
+                     request.title, request.end_time), message_id=request.bot_message_id)
+
+    # Load all active role requests from the saved state on restart, fetching the owners concurrently
+    # Iterate over a copy, the awaits give other handlers a chance to change 'app.requests'
+    requests = list(app.requests.values())
+    results = await asyncio.gather(*(restore(request) for request in requests), return_exceptions=True)
+    for request, result in zip(requests, results):
+        if isinstance(result, Exception):
+            logger.error(
+                f"Failed to load role request in thread {request.thread_id}: {result}")
 
     logger.info("Loaded all active role requests!")
 
 
+def _build_vote_embed(request: RoleRequest, owner: discord.User) -> discord.Embed:
+    """
+    Build the embed of a request's vote message, including the current member count.
+
+    Args:
+        request (RoleRequest): The role request.
+        owner (discord.User): The user that made the request.
+
+    Returns:
+        discord.Embed: The embed.
+    """
+
+    embed = discord.Embed(
+        title=f"Role Application - {request.role}",
+        description=f"{owner.mention} is applying for {request.role}! Do you think they meet the standards required? Take a look at their ships in-game and then vote below.",
+        color=discord.Color.blue(),
+    )
+    embed.add_field(
+        name="Deadline",
+        value=f"Voting ends <t:{request.end_time}:F> or <t:{request.end_time}:R>.",
+    )
+    embed.add_field(
+        name="Threshold",
+        value=f"**{request.threshold*100:.0f}%** 'Yes'{'' if request.ignore_vote_weight else ' (weighted)'} votes are required to approve.",
+    )
+    # Index 2
+    embed.add_field(
+        name="",
+        value=request.voter_count_string(),
+        inline=False,
+    )
+    if request.ignore_vote_weight:
+        embed.add_field(
+            name="",
+            value="*Vote weighting is ignored for this role request. Use `/help` for more info.*",
+            inline=False,
+        )
+
+    return embed
+
+
 async def _init_request(thread: discord.Thread):
     """
     Creates a new RoleRequest and VoteView from the request thread.
@@ -502,7 +776,7 @@ async def _init_request(thread: discord.Thread):
     # Create an active role request for the first time
     thread_title = thread.name
     thread_id = thread.id
-    end_time = int(datetime.now(timezone.utc).timestamp() + VOTE_TIME_PERIOD)
+    end_time = int(time.time() + VOTE_TIME_PERIOD)
     role = None
 
     # Try to extract the role from the thread tags
@@ -522,70 +796,133 @@ async def _init_request(thread: discord.Thread):
 
     # Bunch of work needed to check roles below
     request = app.get_request(thread_id)
-    guild = (bot.get_channel(CHANNEL_ID) or await bot.fetch_guild(CHANNEL_ID)).guild
-    owner = await bot.get_or_fetch_user(thread.owner_id)
+    guild = _guild
+    # The member also serves as the owner's user, and is reused by end_vote to hand out the role
     owner_m = guild.get_member(thread.owner_id) or await guild.fetch_member(thread.owner_id)
 
     # People can't apply for a role they already have
-    if request.role in [role.name for role in owner_m.roles] and not DEV_MODE:
+    # A role missing from the cache doesn't exist in the server, so nobody can have it
+    requested_role = _roles_by_name.get(request.role)
+    if not DEV_MODE and requested_role is not None and owner_m.get_role(requested_role.id) is not None:
         logger.error(
-            f"{owner.mention} tried to create a request for {request.role} but they already have it.")
+            f"{owner_m.mention} tried to create a request for {request.role} but they already have it.")
         app.remove_request(thread_id)
         await thread.send(f"Error: You already have the role {request.role}.")
         return
 
     # Finally construct the view
-    view = VoteView(owner, thread_id, thread_title, end_time)
+    view = VoteView(owner_m, thread_id, thread_title, end_time)
 
-    embed = discord.Embed(
-        title=f"Role Application - {request.role}",
-        description=f"{owner.mention} is applying for {request.role}! Do you think they meet the standards required? Take a look at their ships in-game and then vote below.",
-        color=discord.Color.blue(),
-    )
-    embed.add_field(
-        name="Deadline",
-        value=f"Voting ends <t:{end_time}:F> or <t:{end_time}:R>.",
-    )
-    embed.add_field(
-        name="Threshold",
-        value=f"**{request.threshold*100:.0f}%** 'Yes'{'' if request.ignore_vote_weight else ' (weighted)'} votes are required to approve.",
-    )
-    # Index 2
-    embed.add_field(
-        name="",
-        value=f"`{request.num_users}` {'member has' if request.num_users == 1 else 'members have'} voted on this request.",
-        inline=False,
-    )
-    if request.ignore_vote_weight:
-        embed.add_field(
-            name="",
-            value="*Vote weighting is ignored for this role request. Use `/help` for more info.*",
-            inline=False,
-        )
-
-    vote_message = None
-    n = 0
-    while not vote_message and n < 5:
-        try:
-            # Potentially getting an error on send that means a view isn't saved?
-            vote_message = await thread.send(embed=embed, view=view)
-            await vote_message.pin()
-
-            app.update_bot_message_id(thread_id, vote_message.id)
-            break
-        except Exception as e:
+    # Don't leave the request behind in the scheduler if anything below fails
+    try:
+        embed = _build_vote_embed(request, owner_m)
+
+        vote_message = None
+        n = 0
+        while not vote_message and n < 5:
+            try:
+                # Potentially getting an error on send that means a view isn't saved?
+                vote_message = await thread.send(embed=embed, view=view)
+                await vote_message.pin()
+
+                app.update_bot_message_id(thread_id, vote_message.id)
+                break
+            except discord.HTTPException as e:
+                n += 1
+                if n >= 5:
+                    logger.error(f"Error when sending role request message: {e}")
+                    continue
+
+                # Back off exponentially, or for as long as Discord asks when rate limited
+                delay = 2 ** n
+                if e.status == 429:
+                    delay = float(e.response.headers.get("Retry-After", delay))
+                logger.error(
+                    f"Error when sending role request message: {e}\nTrying again in {delay}s.")
+                await asyncio.sleep(delay)
+        else:
             logger.error(
-                f"Error when sending role request message: {e}\nTrying again.")
-            n += 1
-    else:
-        logger.error(
-            f"Failed to send role request message in {thread_id} after {n} tries. Deleting request.")
-        app.remove_request(thread_id)
-        await thread.send(f"Failed to send role request message in {thread_id} after {n} tries. Deleting request.")
-        return
+                f"Failed to send role request message in {thread_id} after {n} tries. Deleting request.")
+            _unschedule_vote_end(thread_id)
+            app.remove_request(thread_id)
+            await thread.send(f"Failed to send role request message in {thread_id} after {n} tries. Deleting request.")
+            return
+    except Exception:
+        _unschedule_vote_end(thread_id)
+        if app.get_request(thread_id) is not None:
+            app.remove_request(thread_id)
+        raise
 
     logger.info(
-        f"Created new role request for '{request.role}' in '{thread_id}' by '{owner.mention}'.")
+        f"Created new role request for '{request.role}' in '{thread_id}' by '{owner_m.mention}'.")
+
+
+def _cache_forum_tags(forum: discord.ForumChannel):
+    """
+    Rebuild '_tags_by_name' from the role requests forum channel.
+
+    Args:
+        forum (discord.ForumChannel): The role requests forum channel.
+    """
+
+    _tags_by_name.clear()
+    _tags_by_name.update({tag.name: tag for tag in reversed(forum.available_tags)})
+
+
+@bot.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    """
+    Event handler for when a channel is edited. Keeps '_tags_by_name' current.
+
+    Args:
+        before (discord.abc.GuildChannel): The channel before the update.
+        after (discord.abc.GuildChannel): The channel after the update.
+    """
+
+    if after.id == CHANNEL_ID:
+        _cache_forum_tags(after)
+
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    """
+    Event handler for when a role is created. Keeps '_roles_by_name' current.
+
+    Args:
+        role (discord.Role): The new role.
+    """
+
+    if role.guild == _guild:
+        _roles_by_name.setdefault(role.name, role)
+
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    """
+    Event handler for when a role is edited. Keeps '_roles_by_name' current.
+
+    Args:
+        before (discord.Role): The role before the update.
+        after (discord.Role): The role after the update.
+    """
+
+    if after.guild == _guild:
+        if _roles_by_name.get(before.name) == before:
+            del _roles_by_name[before.name]
+        _roles_by_name[after.name] = after
+
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    """
+    Event handler for when a role is deleted. Keeps '_roles_by_name' current.
+
+    Args:
+        role (discord.Role): The deleted role.
+    """
+
+    if role.guild == _guild and _roles_by_name.get(role.name) == role:
+        del _roles_by_name[role.name]
 
 
 @bot.event
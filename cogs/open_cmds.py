@@ -1,22 +1,21 @@
 import discord
+from collections import defaultdict
+from typing import Optional
 from discord.ext import commands
-from bot import logger, app
+from bot import logger, app, _views_by_thread
 from config import ACCEPTANCE_THRESHOLDS, CHANNEL_ID, IGNORE_VOTE_WEIGHT, ROLE_VOTES, VALID_ROLES
 
 # Bunch of setup for the help command
+# Group the roles by acceptance threshold in a single pass
+roles_by_threshold = defaultdict(list)
+for role, percent in ACCEPTANCE_THRESHOLDS.items():
+    roles_by_threshold[percent].append(role)
+
 # Create a string that lists the acceptance thresholds and the roles associated with each threshold
 thresholds_str = "\n".join(
-    f"{percent1 * 100}%: "  # Convert the threshold to a percentage string
-    + ", ".join(
-        [
-            role  # List the roles
-            # Iterate over the acceptance thresholds
-            for role, percent2 in ACCEPTANCE_THRESHOLDS.items()
-            if percent1 == percent2  # Match roles with the same threshold
-        ]
-    )
-    # Ensure unique and sorted thresholds
-    for percent1 in set(sorted(ACCEPTANCE_THRESHOLDS.values()))
+    # Convert the threshold to a percentage string and list the roles
+    f"{percent * 100}%: " + ", ".join(roles_by_threshold[percent])
+    for percent in sorted(roles_by_threshold)  # Sorted, unique thresholds
 )
 
 # Create a dictionary of roles and their vote weights, including only valid roles and "Excelsior"
@@ -27,15 +26,16 @@ relevant_roles = {
     if role in VALID_ROLES or role == "Excelsior"
 }
 
+# Group the relevant roles by vote weight in a single pass
+roles_by_weight = defaultdict(list)
+for role, weight in relevant_roles.items():
+    roles_by_weight[weight].append(role)
+
 # Create a string that lists the vote weights and the roles associated with each weight
 vote_weights_str = "\n".join(
-    f"{weight1}: "  # Convert the weight to a string
-    + ", ".join(
-        # List roles with the same weight
-        [role for role, weight2 in relevant_roles.items() if weight1 == weight2]
-    )
-    # Ensure unique and sorted weights
-    for weight1 in set(sorted(relevant_roles.values()))
+    # Convert the weight to a string and list the roles with that weight
+    f"{weight}: " + ", ".join(roles_by_weight[weight])
+    for weight in sorted(roles_by_weight)  # Sorted, unique weights
 )
 
 # Create a string that lists the roles where vote weight is ignored
@@ -62,12 +62,68 @@ After a set amount of time, the bot will show the results of the poll and automa
 """
 
 
+def in_role_request_thread():
+    """
+    Check for commands that can only be used in a role request thread.
+    Dependent on 'CHANNEL_ID' constant in config.
+    """
+    async def predicate(ctx) -> bool:
+        return isinstance(ctx.channel, discord.Thread) and ctx.channel.parent_id == CHANNEL_ID
+
+    return commands.check(predicate)
+
+
 class OpenCmds(commands.Cog):
     """Commands that can be used in any role request thread by anyone."""
 
     def __init__(self, bot):
         self.bot = bot
 
+    async def _get_active_view(self, ctx) -> Optional[discord.ui.View]:
+        """
+        Performs the basic checks for commands that act on the vote in the current thread and returns its view if valid.
+        Responds to the user itself if not. The thread itself is checked by in_role_request_thread().
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command invocation.
+
+        Returns:
+            Optional[VoteView]
+        """
+
+        # Check if it's an active request
+        if app.get_request(ctx.channel.id) is None:
+            await ctx.respond("There is no active request in this thread.", ephemeral=True)
+            return
+
+        # Get the view
+        view = _views_by_thread.get(ctx.channel.id)
+        if view is None:
+            logger.warning(f"VoteView not found for thread {ctx.channel.id}")
+            await ctx.respond("An error occurred while processing your vote.", ephemeral=True)
+            return
+
+        return view
+
+    async def cog_command_error(self, ctx, error):
+        """
+        Handles errors raised by this cog's commands, including failed in_role_request_thread() checks.
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command invocation.
+            error (discord.DiscordException): The error that was raised.
+        """
+        if isinstance(error, commands.CheckFailure):
+            await ctx.respond("This command can only be used in a role request thread.", ephemeral=True)
+            return
+
+        # This handler replaces pycord's default traceback printing, so keep the traceback in the log
+        logger.error(f"Error in command {ctx.command} in channel {ctx.channel_id}: {error}", exc_info=error)
+        try:
+            await ctx.respond("An error occurred while processing your command.", ephemeral=True)
+        except discord.HTTPException as e:
+            logger.error(f"Failed to send error response for command {ctx.command}: {e}")
+
     @commands.slash_command(description="Instructions for using bot, and provides a link to source code")
     async def help(self, ctx):
         """
@@ -82,6 +138,7 @@ class OpenCmds(commands.Cog):
         await ctx.respond(f"`Ping: {latency_ms:.2f}ms`")
 
     @commands.slash_command(description="Votes on this request.")
+    @in_role_request_thread()
     async def vote_on_request(self, ctx, vote: discord.Option(str, choices=["Yes", "No"])):
         """
         Votes on the current role request thread.
@@ -92,27 +149,15 @@ class OpenCmds(commands.Cog):
             ctx (discord.ApplicationContext): The context of the command invocation.
             vote (str): The vote to cast, either "Yes" or "No".
         """
-        # Check if the command is used in a thread
-        if not isinstance(ctx.channel, discord.Thread) or ctx.channel.parent_id != CHANNEL_ID:
-            await ctx.respond("This command can only be used in a role request thread.", ephemeral=True)
+        view = await self._get_active_view(ctx)
+        if view is None:
             return
 
-        # Check if it's an active request
-        request = app.get_request(ctx.channel.id)
-        if request is None:
-            await ctx.respond("There is no active request in this thread.", ephemeral=True)
-            return
-
-        # Get the view and call the appropriate handle_vote function
-        view = next(
-            (v for v in self.bot.persistent_views if v.thread_id == ctx.channel.id), None)
-        if view:
-            await view.handle_vote(ctx.interaction, vote.lower())
-        else:
-            logger.warning(f"VoteView not found for thread {ctx.channel.id}")
-            await ctx.respond("An error occurred while processing your vote.", ephemeral=True)
+        # Call the appropriate handle_vote function
+        await view.handle_vote(ctx.interaction, vote.lower())
 
     @commands.slash_command(description="Cancels your vote on this request.")
+    @in_role_request_thread()
     async def cancel_my_vote(self, ctx):
         """
         Cancels the user's vote on the current role request thread.
@@ -122,27 +167,18 @@ class OpenCmds(commands.Cog):
         Args:
             ctx (discord.ApplicationContext): The context of the command invocation.
         """
-        # Check if the command is used in a thread
-        if not isinstance(ctx.channel, discord.Thread) or ctx.channel.parent_id != CHANNEL_ID:
-            await ctx.respond("This command can only be used in a role request thread.", ephemeral=True)
-            return
+        # Acknowledge first so the interaction doesn't expire, responses below are sent as followups
+        await ctx.defer(ephemeral=True)
 
-        # Check if it's an active request
-        request = app.get_request(ctx.channel.id)
-        if request is None:
-            await ctx.respond("There is no active request in this thread.", ephemeral=True)
+        view = await self._get_active_view(ctx)
+        if view is None:
             return
 
-        # Get the view and call the appropriate cancel_vote function
-        view = next(
-            (v for v in self.bot.persistent_views if v.thread_id == ctx.channel.id), None)
-        if view:
-            await view.cancel_vote(ctx.interaction)
-        else:
-            logger.warning(f"VoteView not found for thread {ctx.channel.id}")
-            await ctx.respond("An error occurred while processing your vote.", ephemeral=True)
+        # Call the appropriate cancel_vote function
+        await view.cancel_vote(ctx.interaction)
 
     @commands.slash_command(description="Submit anonymous feedback on the current role request.")
+    @in_role_request_thread()
     async def submit_request_feedback(self, ctx, feedback: discord.Option(str, required=True)):
         """
         Submit feedback on the current role request.
@@ -153,26 +189,16 @@ class OpenCmds(commands.Cog):
             ctx (discord.ApplicationContext): The context of the command invocation.
             feedback (str): The feedback to submit.
         """
-        # Check if the command is used in a thread
-        if not isinstance(ctx.channel, discord.Thread) or ctx.channel.parent_id != CHANNEL_ID:
-            await ctx.respond("This command can only be used in a role request thread.", ephemeral=True)
-            return
+        # Acknowledge first so the interaction doesn't expire, responses below are sent as followups
+        await ctx.defer(ephemeral=True)
 
-        # Check if it's an active request
-        request = app.get_request(ctx.channel.id)
-        if request is None:
-            await ctx.respond("There is no active request in this thread.", ephemeral=True)
+        view = await self._get_active_view(ctx)
+        if view is None:
             return
 
-        # Get the view and call the appropriate submit_feedback function
-        view = next(
-            (v for v in self.bot.persistent_views if v.thread_id == ctx.channel.id), None)
-        if view:
-            await view.submit_feedback(ctx.interaction, ctx.user.id, feedback)
-            await ctx.respond("Thank you for your feedback!", ephemeral=True)
-        else:
-            logger.warning(f"VoteView not found for thread {ctx.channel.id}")
-            await ctx.respond("An error occurred while processing your vote.", ephemeral=True)
+        # Call the appropriate submit_feedback function
+        await view.submit_feedback(ctx.interaction, ctx.user.id, feedback)
+        await ctx.respond("Thank you for your feedback!", ephemeral=True)
 
 
 def setup(bot):
@@ -1,18 +1,37 @@
 import asyncio
 import io
+from itertools import chain
 import discord
 from utils import get_user_names, respond_long_message
 from typing import Optional
 from discord.ext import commands
-from bot import logger, app, end_vote, _init_request
+from bot import logger, app, end_vote, _init_request, _unschedule_vote_end, _views_by_thread
 from config import CHANNEL_ID, COMMAND_WHITELISTED_ROLES, DEV_MODE, LOG_FILE_NAME, MOD_LOG_CHANNEL_ID
 
+# Set of role names allowed to use restricted commands
+_WHITELIST = frozenset(COMMAND_WHITELISTED_ROLES)
+
+
+def _read_log_file() -> bytes:
+    """
+    Read the whole log file. Blocking, run it with asyncio.to_thread().
+    Dependent on 'LOG_FILE_NAME' constant in config.
+
+    Returns:
+        bytes: The contents of the log file.
+    """
+
+    with open(LOG_FILE_NAME, "rb") as log_file:
+        return log_file.read()
+
 
 class RestrictedCmds(commands.Cog):
     """Restricted commands that can only be used by specific roles."""
 
     def __init__(self, bot):
         self.bot: discord.Bot = bot
+        self._mod_log_channel = None  # Resolved by _get_mod_log_channel() on first use
+        self._mod_log_tasks: set = set()  # Moderation log messages still being sent
 
     async def _restricted_cmd_ctx_to_thread(self, ctx) -> Optional[discord.Thread]:
         """
@@ -27,10 +46,7 @@ class RestrictedCmds(commands.Cog):
         """
 
         # Make sure they have the perms
-        for role in ctx.user.roles:
-            if role.name in COMMAND_WHITELISTED_ROLES or DEV_MODE:
-                break
-        else:
+        if not DEV_MODE and _WHITELIST.isdisjoint(role.name for role in ctx.user.roles):
             await ctx.respond("You don't have permission to do that.", ephemeral=True)
             return
 
@@ -51,6 +67,19 @@ class RestrictedCmds(commands.Cog):
         return thread
         
     
+    async def _get_mod_log_channel(self) -> discord.abc.Messageable:
+        """
+        Get the moderation log channel, only fetching it the first time.
+        Dependant on the 'MOD_LOG_CHANNEL' constant in config.
+
+        Returns:
+            discord.abc.Messageable: The moderation log channel.
+        """
+
+        if self._mod_log_channel is None:
+            self._mod_log_channel = self.bot.get_channel(MOD_LOG_CHANNEL_ID) or await self.bot.fetch_channel(MOD_LOG_CHANNEL_ID)
+        return self._mod_log_channel
+
     async def _log_command_use(self, ctx, command_name) -> bool:
         """
         Log command usage to the moderation log channel.
@@ -61,12 +90,16 @@ class RestrictedCmds(commands.Cog):
             command_name (str): The name of the command being used.
         
         Returns:
-            bool: True if logging was successful, False otherwise.
+            bool: True if the moderation log channel was found, False otherwise.
         """
         if MOD_LOG_CHANNEL_ID:
             try:
-                channel = self.bot.get_channel(MOD_LOG_CHANNEL_ID) or await self.bot.fetch_channel(MOD_LOG_CHANNEL_ID)
-                await channel.send(f"{ctx.user.mention} used the '{command_name}' command in {ctx.channel.mention}.")
+                channel = await self._get_mod_log_channel()
+                # Sent in the background so the command doesn't wait on it, failures are logged by the callback
+                task = asyncio.create_task(channel.send(
+                    f"{ctx.user.mention} used the '{command_name}' command in {ctx.channel.mention}."))
+                self._mod_log_tasks.add(task)
+                task.add_done_callback(self._mod_log_sent)
                 logger.info(f"User {ctx.user} used the '{command_name}' command in {ctx.channel.mention}.")
                 return True
             except Exception as e:
@@ -75,6 +108,18 @@ class RestrictedCmds(commands.Cog):
                 return False
         return True
 
+    def _mod_log_sent(self, task: asyncio.Task):
+        """
+        Done callback for moderation log messages sent by _log_command_use().
+
+        Args:
+            task (asyncio.Task): The finished send.
+        """
+
+        self._mod_log_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to log command use: {task.exception()}")
+
     @commands.slash_command(description="Manually create a vote in this thread. Requires moderator or Paragon roles.")
     async def create_vote(self, ctx):
         """
@@ -85,6 +130,9 @@ class RestrictedCmds(commands.Cog):
             ctx (discord.ext.commands.Context): The context of the command.
         """
 
+        # Creating the vote can take a while, acknowledge first so the interaction doesn't expire
+        await ctx.defer(ephemeral=True)
+
         # Get the thread
         thread = await self._restricted_cmd_ctx_to_thread(ctx)
         if thread is None:
@@ -130,8 +178,7 @@ class RestrictedCmds(commands.Cog):
             return
 
         # Get the view
-        view = next(
-            (v for v in self.bot.persistent_views if v.thread_id == thread.id), None)
+        view = _views_by_thread.get(thread.id)
         if view is None:
             await ctx.respond("This thread is not currently being voted on.", ephemeral=True)
             return
@@ -166,9 +213,11 @@ class RestrictedCmds(commands.Cog):
                 return
 
             # Ask for confirmation
+            # Unique per command use, so concurrent confirmations can't trigger each other
+            confirm_id = f"confirm_delete_{thread.id}_{ctx.interaction.id}"
             view = discord.ui.View()
             view.add_item(discord.ui.Button(label="Confirm",
-                        style=discord.ButtonStyle.danger, custom_id="confirm"))
+                        style=discord.ButtonStyle.danger, custom_id=confirm_id))
             await ctx.interaction.response.send_message(
                 "Are you sure you want to force-delete this request? This action cannot be undone.",
                 view=view,
@@ -179,7 +228,10 @@ class RestrictedCmds(commands.Cog):
                 # Wait for the user to click the button
                 interaction = await self.bot.wait_for(
                     "interaction",
-                    check=lambda i: i.data["custom_id"] == "confirm" and i.user.id == ctx.author.id,
+                    # Every interaction the bot receives is checked, skip anything that isn't a component first
+                    check=lambda i: i.type == discord.InteractionType.component
+                    and (i.data or {}).get("custom_id") == confirm_id
+                    and i.user.id == ctx.author.id,
                     timeout=60.0
                 )
             except asyncio.TimeoutError:
@@ -188,24 +240,35 @@ class RestrictedCmds(commands.Cog):
 
             # User confirmed, proceed with deletion
             await interaction.response.defer()
-            await ctx.interaction.edit_original_message(content="Proceeding with force-delete...", view=None)
 
-            # Log command use to moderation log channel
-            if not await self._log_command_use(ctx, "force-delete-request"):
+            # Log command use to moderation log channel, while updating the prompt
+            _, logged = await asyncio.gather(
+                ctx.interaction.edit_original_message(content="Proceeding with force-delete...", view=None),
+                self._log_command_use(ctx, "force-delete-request"),
+            )
+            if not logged:
                 return
 
             # Force-delete the request
             request = app.get_request(thread.id)
             if request is not None:
-                try:
-                    message = await thread.fetch_message(request.bot_message_id)
-                    await message.delete()
-                except:
-                    # No vote message exists, our job is already done
-                    pass
+                _unschedule_vote_end(thread.id)
                 app.remove_request(thread.id)
 
-                await ctx.respond("Request deleted.", ephemeral=True)
+                async def delete_vote_message():
+                    if request.bot_message_id is None:
+                        return
+                    try:
+                        # Deleting by ID doesn't need the message to be fetched first
+                        await thread.get_partial_message(request.bot_message_id).delete()
+                    except discord.HTTPException:
+                        # No vote message exists, our job is already done
+                        pass
+
+                await asyncio.gather(
+                    delete_vote_message(),
+                    ctx.respond("Request deleted.", ephemeral=True),
+                )
             else:
                 await ctx.respond("This thread is not an active role request.", ephemeral=True)
 
@@ -223,6 +286,10 @@ class RestrictedCmds(commands.Cog):
             ctx (discord.ext.commands.Context): The context of the command.
         """
 
+        # Looking up every voter can take a while, acknowledge first so the interaction doesn't expire
+        await ctx.defer(ephemeral=True)
+
+        progress_message = None
         try:
             # Get the thread
             thread = await self._restricted_cmd_ctx_to_thread(ctx)
@@ -232,46 +299,57 @@ class RestrictedCmds(commands.Cog):
             _guild: discord.Guild = ctx.guild
 
             # Get the most recent request
-            request = app.get_request(
-                thread.id) or app.get_closed_requests(thread.id)
+            request = app.get_any_request(thread.id)
             if request is None:
                 await ctx.respond("This thread is not an active role request and has no closed requests.", ephemeral=True)
                 return
-            if isinstance(request, list):
-                request = request[-1]
 
             # Log command use to moderation log channel
             if not await self._log_command_use(ctx, "show-votes"):
                 return
 
+            # Let the moderator know something is happening while the voters are looked up
+            progress_message = await ctx.followup.send("Gathering voter data...", ephemeral=True)
+
             # Create a markdown formatted string to display voting data
             voting_data = f"# Voting Data for {request.role} Request\n\n"
             voting_data += f"**Request Title:** {request.title}\n"
-            name = await get_user_names(self.bot, _guild, request.user_id)
-            voting_data += f"**Requester:** {name[0]} (<@{request.user_id}>)\n\n"
 
+            # Look up the requester, every voter, feedback author and vetoer once, concurrently
+            user_ids = list(dict.fromkeys(chain(
+                (request.user_id,),
+                request.votes,
+                (user_id for user_id, _ in request.feedback),
+                (request.veto[0],) if request.veto else (),
+            )))
+            user_names = dict(zip(user_ids, await asyncio.gather(
+                *(get_user_names(self.bot, _guild, user_id) for user_id in user_ids)
+            )))
+
+            voting_data += f"**Requester:** {user_names[request.user_id][0]} (<@{request.user_id}>)\n\n"
+
+            # Get the vote data, sorted by number of votes
+            all_votes = chain(
+                ((user_id, "Yes", vote_count) for user_id, vote_count in request.yes_votes),
+                ((user_id, "No", vote_count) for user_id, vote_count in request.no_votes),
+            )
+            vote_data = sorted(
+                ((*user_names[user_id], vote_type, vote_count) for user_id, vote_type, vote_count in all_votes),
+                key=lambda x: x[3],
+                reverse=True,
+            )
 
-            # Get the vote data
-            vote_data = []
-            for vote_list, vote_type in [(request.yes_votes, "Yes"), (request.no_votes, "No")]:
-                for user_id, vote_count in vote_list:
-                    display_name, username = await get_user_names(self.bot, _guild, user_id)
-                    vote_data.append((display_name, username, vote_type, vote_count))
-
-            # Sort vote data by number of votes
-            vote_data.sort(key=lambda x: x[3], reverse=True)
+            # Create the table with dynamic field sizes, joined once instead of growing a string per row
+            full_names = [f"{display_name} ({username}):" for display_name, username, _, _ in vote_data]
+            longest_name = max(map(len, full_names), default=len("User"))
 
-            # Create the table with dynamic field sizes
-            voting_data += "## Votes\n\n"
-            longest_name = max(len(f"{display_name} ({username}):") for display_name, username, _, _ in vote_data)
-            
             header = f"| {'User':<{longest_name}} | Vote | Count |\n"
             separator = f"|{'-' * (longest_name + 2)}|------|-------|\n"
-            voting_data += header + separator
-            
-            for display_name, username, vote_type, vote_count in vote_data:
-                full_name = f"{display_name} ({username}):"
-                voting_data += f"| {full_name:<{longest_name}} | {vote_type:<4} | {vote_count:<5} |\n"
+            rows = "".join(
+                f"| {full_name:<{longest_name}} | {vote_type:<4} | {vote_count:<5} |\n"
+                for full_name, (_, _, vote_type, vote_count) in zip(full_names, vote_data)
+            )
+            voting_data += "## Votes\n\n" + header + separator + rows
 
             # Add vote totals and outcome
             yes_count, no_count = request.get_votes()
@@ -283,10 +361,10 @@ class RestrictedCmds(commands.Cog):
             # Create feedback file if any
             feedback_file = None
             if request.feedback:
-                feedback_content = ""
-                for user_id, feedback in request.feedback:
-                    display_name, username = await get_user_names(self.bot, _guild, user_id)
-                    feedback_content += f"# {display_name} ({username}):\n```{feedback}```\n\n"
+                feedback_content = "".join(
+                    "# {} ({}):\n```{}```\n\n".format(*user_names[user_id], feedback)
+                    for user_id, feedback in request.feedback
+                )
                 feedback_file = discord.File(io.StringIO(feedback_content), filename="feedback.md")
             else:
                 voting_data += "\n## Feedback\n\nNo feedback submitted\n"
@@ -294,16 +372,24 @@ class RestrictedCmds(commands.Cog):
             # Add veto information if any
             if request.veto:
                 veto_user_id, veto_result = request.veto
-                veto_display_name, veto_user_name = await get_user_names(self.bot, _guild, veto_user_id)
+                veto_display_name, veto_user_name = user_names[veto_user_id]
                 voting_data += "\n## Veto\n\n"
                 voting_data += f"Veto by {veto_display_name} ({veto_user_name}): {'Approved' if veto_result else 'Denied'}\n"
 
             # Send the embed and feedback file
             # await ctx.respond(content="Command use logged.", embed=embed, file=feedback_file, ephemeral=True)
+            await progress_message.edit(content="Command use logged.")
             await respond_long_message(ctx.interaction, voting_data, use_codeblock=True, file=feedback_file, ephemeral=True)
 
         except Exception as e:
             logger.error(f"Error showing votes in thread {thread.id}: {e}")
+            # Don't leave the progress message behind next to the error
+            if progress_message is not None:
+                try:
+                    await progress_message.edit(content="Failed to show voting data.")
+                    return
+                except discord.HTTPException:
+                    pass
             await ctx.respond("Failed to show voting data.", ephemeral=True)
 
 
@@ -316,12 +402,14 @@ class RestrictedCmds(commands.Cog):
             ctx (discord.ext.commands.Context): The context of the command.
         """
 
-        # Get the log file
-        log_file = open(LOG_FILE_NAME, "rb")
+        # Uploading the file can take a while, acknowledge first so the interaction doesn't expire
+        await ctx.defer(ephemeral=True)
+
+        # Get the log file, reading it off the event loop
+        log_bytes = await asyncio.to_thread(_read_log_file)
 
         # Send the log file
-        await ctx.respond(file=discord.File(log_file, LOG_FILE_NAME), ephemeral=True)
-        log_file.close()
+        await ctx.respond(file=discord.File(io.BytesIO(log_bytes), LOG_FILE_NAME), ephemeral=True)
 
 
 def setup(bot):
@@ -93,16 +93,22 @@ THREAD_TAGS = {"Approved": "Approved", "Denied": "Denied"}
 
 
 VOTE_TIME_PERIOD = (60 * 60 * 24 * 7)  # 7 days in seconds
-CHECK_TIME = 60  # how often you want to check if the voting period has ended; in seconds
 CLOSE_POST = False  # if true, the bot will close the post after the voting period ends
+MEMBER_COUNT_EDIT_DELAY = 2.0  # seconds to wait before updating the vote message's member count, votes in between share one edit
 
 # Vote feedback
 PROMPT_NO_VOTERS_FOR_FEEDBACK = True # whether to prompt people voting 'no' for feedback
 PROMPT_YES_VOTERS_FOR_FEEDBACK = True # whether to prompt people voting 'yes' for feedback
 PROMPT_AFTER_FIRST_FEEDBACK = True # whether to only prompt people until someone submits feedback, or keep prompting everyone
+FEEDBACK_MODAL_TIMEOUT = 180 # seconds to wait for the feedback prompt, after that the vote is recorded without feedback
 
 CHANNEL_ID = 1101149194498089051  # Forum channel ID
 MOD_LOG_CHANNEL_ID = 546319957827518474  # Channel for moderation logs
 STATE_FILE_NAME = "requests_state.json"
+WAL_FILE_NAME = "requests_state.wal"  # append-only log of changes made since the last state snapshot
+WAL_COMPACT_THRESHOLD = 500  # number of logged changes before the log is folded into a fresh snapshot
+CLOSED_FILE_NAME = "requests_closed.jsonl"  # append-only history of closed requests, one per line
+STATE_FLUSH_INTERVAL = 0.5  # seconds changes may wait before being written to disk, so bursts share one write
+STATE_FLUSH_MAX_PENDING = 100  # number of waiting changes that triggers a write without waiting out the interval
 LOG_FILE_NAME = "requests_log.txt"
 DEV_MODE = False  # for ease of testing, turns off many checks
@@ -1,9 +1,33 @@
 from config import ACCEPTANCE_THRESHOLDS, IGNORE_VOTE_WEIGHT, VALID_ROLES
 import re
-from datetime import datetime, timezone
+import time
+
+# Member count line of the vote embed, indexed by whether exactly one member voted
+_VOTER_COUNT_TEMPLATES = (
+    "`{n}` members have voted on this request.",
+    "`{n}` member has voted on this request.",
+)
 
 
 class RoleRequest:
+    # No per-instance __dict__, requests are kept in memory for the bot's whole lifetime
+    __slots__ = (
+        "user_id",
+        "thread_id",
+        "title",
+        "end_time",
+        "bot_message_id",
+        "role",
+        "votes",
+        "yes_total",
+        "no_total",
+        "feedback",
+        "veto",
+        "ignore_vote_weight",
+        "closed",
+        "threshold",
+    )
+
     def __init__(
         self, user_id: int, thread_id: int, title: str, end_time: int, role: str = None,
     ):
@@ -25,10 +49,11 @@ class RoleRequest:
         self.end_time: str = end_time
         self.bot_message_id = None
         self.role = role
-        self.yes_votes: list = []  # List of (userid, vote #)
-        self.no_votes: list = []  # List of (userid, vote #)
+        self.votes: dict = {}  # userid -> vote #, negative are "no" votes
+        # Running sums of 'votes', so the totals don't need a pass over every vote
+        self.yes_total: int = 0
+        self.no_total: int = 0
         self.feedback: list = []  # List of (userid, feedback)
-        self.num_users: int = 0  # Number of users that cast a vote
 
         # (int, bool) = (user_id, veto); user being the one to make the veto
         self.veto: None | (int, bool) = None
@@ -69,16 +94,44 @@ class RoleRequest:
             role=data.get("role"),
         )
         instance.bot_message_id = data.get("bot_message_id")
-        instance.yes_votes = data.get("yes_votes") or []
-        instance.no_votes = data.get("no_votes") or []
+        for user_id, votes in data.get("yes_votes") or []:
+            instance.votes[user_id] = votes
+            instance.yes_total += votes
+        for user_id, votes in data.get("no_votes") or []:
+            instance.votes[user_id] = -votes
+            instance.no_total += votes
         instance.feedback = data.get("feedback") or []
-        instance.num_users = data.get("num_users") or 0
         instance.veto = data.get("veto")
         instance.closed = data.get("closed") or int(
-            instance.end_time) < int(datetime.now(timezone.utc).timestamp())
+            instance.end_time) < int(time.time())
 
         return instance
 
+    @property
+    def yes_votes(self):
+        """List of (userid, vote #) for the "yes" votes."""
+        return [(user_id, votes) for user_id, votes in self.votes.items() if votes >= 0]
+
+    @property
+    def no_votes(self):
+        """List of (userid, vote #) for the "no" votes."""
+        return [(user_id, -votes) for user_id, votes in self.votes.items() if votes < 0]
+
+    @property
+    def num_users(self):
+        """Number of users that cast a vote."""
+        return len(self.votes)
+
+    def voter_count_string(self):
+        """
+        Get the line shown on the vote message saying how many members have voted.
+
+        Returns:
+            str: The member count line.
+        """
+        num_users = self.num_users
+        return _VOTER_COUNT_TEMPLATES[num_users == 1].format(n=num_users)
+
     def vote(self, user_id: int, votes: int):
         """
         Vote on the role request.
@@ -92,12 +145,12 @@ class RoleRequest:
         if self.ignore_vote_weight:
             votes = (-1 if votes < 0 else 1)
 
+        self._pop_vote(user_id)
+        self.votes[user_id] = votes
         if votes < 0:
-            self.no_votes.append((user_id, votes * -1))
+            self.no_total -= votes
         else:
-            self.yes_votes.append((user_id, votes))
-
-        self._update_usercount()
+            self.yes_total += votes
 
     def vote_or_change(self, user_id: int, new_votes: int):
         """
@@ -106,14 +159,15 @@ class RoleRequest:
         Args:
             user_id (int): The ID of the user voting or changing their vote.
             new_votes (int): The new number of votes. Negative are "no" votes.
+
+        Returns:
+            bool: True if an existing vote was changed, False if this is a new vote.
         """
 
-        if self.has_voted(user_id):
-            self.yes_votes = [
-                vote for vote in self.yes_votes if vote[0] != user_id]
-            self.no_votes = [
-                vote for vote in self.no_votes if vote[0] != user_id]
+        # Popping first keeps a changed vote at the end, like a fresh one
+        changed = self._pop_vote(user_id) is not None
         self.vote(user_id, new_votes)
+        return changed
 
     def remove_vote(self, user_id: int):
         """
@@ -122,10 +176,18 @@ class RoleRequest:
         Args:
             user_id (int): The ID of the user whose vote should be removed.
         """
-        self.yes_votes = [
-            vote for vote in self.yes_votes if vote[0] != user_id]
-        self.no_votes = [vote for vote in self.no_votes if vote[0] != user_id]
-        self._update_usercount()
+        self._pop_vote(user_id)
+
+    def _pop_vote(self, user_id: int):
+        votes = self.votes.pop(user_id, None)
+        if votes is None:
+            return None
+
+        if votes < 0:
+            self.no_total += votes
+        else:
+            self.yes_total -= votes
+        return votes
 
     def submit_feedback(self, user_id: int, feedback: str):
         """
@@ -146,13 +208,7 @@ class RoleRequest:
             tuple (yes_count, no_count): A tuple containing the count of yes votes and no votes.
         """
 
-        yes_count = sum(vote[1] for vote in self.yes_votes) or 0
-        no_count = sum(vote[1] for vote in self.no_votes) or 0
-        return (yes_count, no_count)
-
-    def _update_usercount(self):
-        self.num_users = len(self.yes_votes) + len(self.no_votes)
-        return
+        return (self.yes_total, self.no_total)
 
     def has_voted(self, user_id: int):
         """
@@ -164,7 +220,7 @@ class RoleRequest:
         Returns:
             bool: True if the user has voted, False otherwise.
         """
-        return user_id in [vote[0] for vote in self.yes_votes + self.no_votes]
+        return user_id in self.votes
 
     def has_submitted_feedback(self, user_id: int):
         """
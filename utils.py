@@ -1,8 +1,16 @@
+from collections import OrderedDict
 from typing import Optional, Tuple
 import discord
 from request import RoleRequest
 from config import ROLE_VOTES, DEFAULT_VOTE
 
+# Names of roles with a vote weight, for intersecting with a member's roles
+_ROLE_VOTE_NAMES = frozenset(ROLE_VOTES)
+# Users fetched over REST, bot.get_user() only knows users the bot shares a cached guild with
+# Least recently used first, capped at '_USER_CACHE_SIZE'
+_user_cache: OrderedDict = OrderedDict()
+_USER_CACHE_SIZE = 256
+
 
 def get_user_votes(user: discord.Member, request: RoleRequest) -> int:
     """
@@ -20,12 +28,40 @@ def get_user_votes(user: discord.Member, request: RoleRequest) -> int:
     if request.ignore_vote_weight:
         return DEFAULT_VOTE
 
-    res = DEFAULT_VOTE
-    for role in user.roles:
-        if role.name in ROLE_VOTES:
-            res = max(res, ROLE_VOTES[role.name])
+    hits = _ROLE_VOTE_NAMES.intersection(role.name for role in user.roles)
+    # Never below DEFAULT_VOTE, even for roles configured with fewer votes
+    return max(DEFAULT_VOTE, *(ROLE_VOTES[name] for name in hits))
+
+async def get_cached_user(bot: discord.Bot, user_id: int) -> Optional[discord.User]:
+    """
+    Get a user from the library's cache, falling back to a small cache of users fetched over REST.
 
-    return res
+    Args:
+        bot (discord.Bot): The bot instance.
+        user_id (int): The ID of the user.
+
+    Returns:
+        Optional[discord.User]: The user, or None if they don't exist.
+    """
+
+    # The library keeps its own cache current, so it wins over anything fetched earlier
+    user = bot.get_user(user_id)
+    if user is not None:
+        return user
+
+    user = _user_cache.get(user_id)
+    if user is not None:
+        _user_cache.move_to_end(user_id)
+        return user
+
+    try:
+        user = await bot.fetch_user(user_id)
+    except discord.errors.NotFound:
+        return None
+    _user_cache[user_id] = user
+    if len(_user_cache) > _USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+    return user
 
 async def get_user_names(bot: discord.Bot, guild: discord.Guild, user_id: int) -> Tuple[str, str]:
     """
@@ -42,7 +78,7 @@ async def get_user_names(bot: discord.Bot, guild: discord.Guild, user_id: int) -
         member: discord.Member = guild.get_member(user_id) or await guild.fetch_member(user_id)
         return member.display_name, member.name
     except discord.errors.NotFound:
-        user: Optional[discord.User] = await bot.get_or_fetch_user(user_id)
+        user: Optional[discord.User] = await get_cached_user(bot, user_id)
         if user is None:
             return 'User', f'#{user_id}'
 